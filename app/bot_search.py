@@ -0,0 +1,479 @@
+import argparse
+import json
+import os
+import random
+import sys
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+from multiprocessing.pool import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+# Игры запускаются без окна:
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# При запуске `python app/bot_search.py` корень проекта не попадает в путь
+# поиска модулей, а без него не импортируется the_snake:
+BASE_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from the_snake import (  # noqa: E402
+    GAME_CONTROL, GRID_HEIGHT, GRID_SIZE, GRID_WIDTH, SCREEN_HEIGHT,
+    SCREEN_WIDTH, TOTAL_CELLS, UP, DOWN, LEFT, RIGHT, POINTER_POSITION,
+    Apple, Snake
+)
+
+CURRENT_DIR: str = os.path.dirname(__file__)
+
+# Размер одной ячейки массива результатов (float64, байты):
+SCORE_ITEM_SIZE: int = 8
+
+# Игра без окна заканчивается, если змейка столько ходов не ест яблоко.
+# Яблок не больше TOTAL_CELLS, поэтому длина игры тоже ограничена:
+MAX_STEPS_WITHOUT_APPLE: int = TOTAL_CELLS
+
+# Стандартное отклонение мутации весов:
+MUTATION_SCALE: float = 0.3
+
+# Результаты игр текущего процесса-исполнителя (см. _attach_scoreboard):
+_scoreboard: Optional[SharedMemory] = None
+_scores: Optional[memoryview] = None
+
+
+class CheckpointMismatchError(ValueError):
+    """Контрольная точка сохранена с другими параметрами поиска."""
+
+
+@dataclass
+class BotWeights:
+    """
+    Веса эвристик бота. Каждый возможный ход оценивается как взвешенная
+    сумма: близость к яблоку, доля свободных клеток, доступных после хода
+    (заливка), и достижимость хвоста.
+    """
+
+    apple_distance: float = 1.0
+    free_space: float = 1.0
+    tail_reachable: float = 1.0
+
+    @classmethod
+    def sample(cls, rng: random.Random) -> 'BotWeights':
+        """Создаёт случайный набор весов."""
+        return cls(*(rng.uniform(0, 5) for _ in fields(cls)))
+
+    def mutate(self, rng: random.Random) -> 'BotWeights':
+        """Возвращает копию весов со случайным гауссовым сдвигом."""
+        return BotWeights(*(
+            max(0.0, value + rng.gauss(0, MUTATION_SCALE))
+            for value in asdict(self).values()
+        ))
+
+
+class SnakeBot:
+    """Эвристический бот, выбирающий направление движения змейки."""
+
+    def __init__(self, weights: Optional[BotWeights] = None):
+        """
+        Parameters
+        ----------
+        weights : BotWeights
+            Веса эвристик. По умолчанию все веса равны единице.
+        """
+        self.weights = weights or BotWeights()
+
+    def choose_direction(
+        self, snake: Snake, apple: Apple
+    ) -> POINTER_POSITION:
+        """
+        Выбирает ход с лучшей оценкой среди продолжения движения и
+        поворотов, разрешённых GAME_CONTROL.
+        """
+        directions = [snake.direction] + [
+            new_direction
+            for (direction, _), new_direction in GAME_CONTROL.items()
+            if direction == snake.direction
+        ]
+        return max(
+            directions,
+            key=lambda direction: self.evaluate(snake, apple, direction)
+        )
+
+    def evaluate(
+        self, snake: Snake, apple: Apple, direction: POINTER_POSITION
+    ) -> float:
+        """Оценивает ход direction. Смертельный ход получает -inf."""
+        new_head = next_position(snake.get_head_position(), direction)
+        # Тело после хода так же, как его получает Snake.move().
+        body = ([new_head] + snake.positions)[:snake.length]
+        obstacles = set(body[1:])
+        if new_head in obstacles:
+            return float('-inf')
+
+        reachable = flood_fill(new_head, obstacles)
+        tail = body[-1]
+        tail_reachable = tail == new_head or any(
+            next_position(tail, step) in reachable
+            for step in (UP, DOWN, LEFT, RIGHT)
+        )
+        return (
+            -self.weights.apple_distance
+            * grid_distance(new_head, apple.position)
+            / (GRID_WIDTH + GRID_HEIGHT)
+            + self.weights.free_space * len(reachable) / TOTAL_CELLS
+            + self.weights.tail_reachable * tail_reachable
+        )
+
+
+def next_position(
+    position: POINTER_POSITION, direction: POINTER_POSITION
+) -> POINTER_POSITION:
+    """Соседняя клетка с учётом выхода за край поля, как в Snake.move()."""
+    dx, dy = direction
+    return (
+        (position[0] + dx * GRID_SIZE) % SCREEN_WIDTH,
+        (position[1] + dy * GRID_SIZE) % SCREEN_HEIGHT
+    )
+
+
+def grid_distance(
+    first: POINTER_POSITION, second: POINTER_POSITION
+) -> int:
+    """Расстояние в клетках между позициями на замкнутом поле."""
+    dx = abs(first[0] - second[0]) // GRID_SIZE
+    dy = abs(first[1] - second[1]) // GRID_SIZE
+    return min(dx, GRID_WIDTH - dx) + min(dy, GRID_HEIGHT - dy)
+
+
+def flood_fill(
+    start: POINTER_POSITION, obstacles: set[POINTER_POSITION]
+) -> set[POINTER_POSITION]:
+    """Множество клеток, достижимых из start в обход obstacles."""
+    reachable = {start}
+    queue = deque([start])
+    while queue:
+        position = queue.popleft()
+        for direction in (UP, DOWN, LEFT, RIGHT):
+            neighbour = next_position(position, direction)
+            if neighbour not in reachable and neighbour not in obstacles:
+                reachable.add(neighbour)
+                queue.append(neighbour)
+    return reachable
+
+
+def play_headless_game(bot: SnakeBot, seed: int) -> int:
+    """
+    Играет одну игру без отрисовки по правилам main() и возвращает длину
+    змейки. Игра заканчивается столкновением, победой или если змейка
+    MAX_STEPS_WITHOUT_APPLE ходов подряд не съела яблоко.
+    """
+    random.seed(seed)
+    snake = Snake()
+    apple = Apple(occupied_positions=snake.positions)
+    steps_without_apple = 0
+
+    while True:
+        snake.next_direction = bot.choose_direction(snake, apple)
+        snake.update_direction()
+
+        if snake.get_head_position() == apple.position:
+            snake.length += 1
+            steps_without_apple = 0
+            if snake.length == TOTAL_CELLS:
+                break
+            apple.randomize_position(snake.positions)
+        elif snake.get_head_position() in snake.positions[1:]:
+            break
+
+        steps_without_apple += 1
+        if steps_without_apple > MAX_STEPS_WITHOUT_APPLE:
+            break
+        snake.move()
+
+    return snake.length
+
+
+def _attach_scoreboard(name: str) -> None:
+    """Инициализатор пула: подключает общий массив результатов."""
+    global _scoreboard, _scores
+    _scoreboard = SharedMemory(name=name)
+    _scores = _scoreboard.buf.cast('d')
+
+
+def _score_game(cell: int, weights: BotWeights, seed: int) -> None:
+    """Записывает результат одной игры в ячейку cell общего массива."""
+    _scores[cell] = play_headless_game(SnakeBot(weights), seed)
+
+
+def score_population(
+    pool: Pool,
+    scoreboard: SharedMemory,
+    population: list[BotWeights],
+    seeds: list[int]
+) -> list[float]:
+    """
+    Оценивает кандидатов параллельно. Каждая игра — отдельная задача пула,
+    процессы пишут её результат в свою ячейку общего массива
+    (population x seeds), обратно передаётся только сигнал о завершении.
+    """
+    games = len(seeds)
+    # Игры длятся от секунд до минут, поэтому задачи раздаются по одной.
+    pool.starmap(_score_game, [
+        (row * games + index, weights, seed)
+        for row, weights in enumerate(population)
+        for index, seed in enumerate(seeds)
+    ], chunksize=1)
+    scores = scoreboard.buf.cast('d')
+    try:
+        return [
+            sum(scores[row * games:(row + 1) * games]) / games
+            for row in range(len(population))
+        ]
+    finally:
+        scores.release()
+
+
+def create_search_pool(
+    population_size: int, games: int, processes: Optional[int] = None
+) -> tuple[Pool, SharedMemory]:
+    """
+    Создаёт общий массив результатов и пул процессов, подключённых к нему.
+    Массив нужно освободить вызовом close() и unlink() после работы пула.
+    """
+    scoreboard = SharedMemory(
+        create=True, size=population_size * games * SCORE_ITEM_SIZE
+    )
+    try:
+        pool = Pool(
+            processes or os.cpu_count(),
+            initializer=_attach_scoreboard,
+            initargs=(scoreboard.name,)
+        )
+    except Exception:
+        scoreboard.close()
+        scoreboard.unlink()
+        raise
+    return pool, scoreboard
+
+
+def load_checkpoint(file_path: str) -> Optional[dict]:
+    """Загружает сохранённое состояние поиска, если оно есть."""
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, mode='r', encoding='utf-8') as file:
+        checkpoint = json.load(file)
+    checkpoint['population'] = [
+        BotWeights(**weights) for weights in checkpoint['population']
+    ]
+    checkpoint['best_weights'] = BotWeights(**checkpoint['best_weights'])
+    version, internal_state, gauss_next = checkpoint['rng_state']
+    checkpoint['rng_state'] = (version, tuple(internal_state), gauss_next)
+    return checkpoint
+
+
+def save_checkpoint(file_path: str, checkpoint: dict) -> None:
+    """Атомарно сохраняет состояние поиска в JSON."""
+    data = dict(checkpoint)
+    data['population'] = [asdict(weights) for weights in data['population']]
+    data['best_weights'] = asdict(data['best_weights'])
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, mode='w', encoding='utf-8') as file:
+        json.dump(data, file)
+    os.replace(tmp_path, file_path)
+
+
+def export_bot_profile(
+    file_path: str, weights: BotWeights, score: float
+) -> None:
+    """Сохраняет веса бота в профиль, который читает load_bot_profile()."""
+    with open(file_path, mode='w', encoding='utf-8') as file:
+        json.dump({'weights': asdict(weights), 'score': score}, file, indent=4)
+
+
+def load_bot_profile(file_path: str) -> SnakeBot:
+    """Создаёт бота по профилю, сохранённому export_bot_profile()."""
+    with open(file_path, mode='r', encoding='utf-8') as file:
+        profile = json.load(file)
+    return SnakeBot(BotWeights(**profile['weights']))
+
+
+def next_generation(
+    rng: random.Random,
+    population: list[BotWeights],
+    scores: list[float],
+    elite: int
+) -> list[BotWeights]:
+    """
+    Оставляет elite лучших кандидатов, остальные места заполняет их
+    мутациями и одним случайным кандидатом для разнообразия.
+    """
+    ranked = [
+        weights for _, weights in sorted(
+            zip(scores, population), key=lambda item: item[0], reverse=True
+        )
+    ]
+    parents = ranked[:min(elite, len(population) - 1)]
+    children = [
+        rng.choice(parents).mutate(rng)
+        for _ in range(len(population) - len(parents) - 1)
+    ]
+    return parents + children + [BotWeights.sample(rng)]
+
+
+def select_final_weights(
+    pool: Pool,
+    scoreboard: SharedMemory,
+    finalists: list[BotWeights],
+    seeds: list[int]
+) -> tuple[BotWeights, float]:
+    """
+    Переигрывает финалистов на общих отложенных сидах. Лучшие оценки
+    поколений получены на разных сидах и не сравнимы между собой.
+    """
+    scores = score_population(pool, scoreboard, finalists, seeds)
+    best_score = max(scores)
+    return finalists[scores.index(best_score)], best_score
+
+
+def search_bot_weights(
+        generations: int = 20,
+        population_size: int = 16,
+        games: int = 8,
+        elite: int = 4,
+        seed: int = 0,
+        checkpoint_name: str = 'bot_search.json',
+        processes: Optional[int] = None
+) -> tuple[BotWeights, float]:
+    """
+    Эволюционный поиск весов бота. Каждый кандидат поколения играет games
+    игр с одними и теми же сидами, чтобы оценки были сравнимы. После каждого
+    поколения состояние сохраняется в checkpoint_name, и повторный запуск
+    продолжает поиск с места остановки. В конце элита последнего поколения
+    и лучший за всё время кандидат переигрываются на отложенных сидах.
+
+    Raises
+    ------
+    CheckpointMismatchError
+        Контрольная точка сохранена с другими параметрами поиска.
+    """
+    params = {
+        'population_size': population_size,
+        'games': games,
+        'elite': elite,
+        'seed': seed,
+    }
+    checkpoint_path = os.path.join(CURRENT_DIR, '..', checkpoint_name)
+    rng = random.Random(seed)
+    checkpoint = load_checkpoint(checkpoint_path) or {
+        'params': params,
+        'generation': 0,
+        'population': [BotWeights()] + [
+            BotWeights.sample(rng) for _ in range(population_size - 1)
+        ],
+        'best_weights': BotWeights(),
+        'best_score': float('-inf'),
+        'rng_state': rng.getstate(),
+    }
+    if checkpoint.get('params') != params:
+        raise CheckpointMismatchError(
+            f'Контрольная точка {checkpoint_name} сохранена с параметрами '
+            f'{checkpoint.get("params")}, а не {params}. Запустите поиск '
+            'с --reset или укажите другой --checkpoint.'
+        )
+    rng.setstate(checkpoint['rng_state'])
+    population = checkpoint['population']
+    holdout_rng = random.Random(f'holdout-{seed}')
+    holdout_seeds = [holdout_rng.randrange(2 ** 32) for _ in range(games)]
+
+    pool, scoreboard = create_search_pool(population_size, games, processes)
+    # Pool.terminate() не подходит: pygame в процессах перехватывает SIGTERM.
+    try:
+        for generation in range(checkpoint['generation'], generations):
+            seeds = [rng.randrange(2 ** 32) for _ in range(games)]
+            scores = score_population(pool, scoreboard, population, seeds)
+            best_score = max(scores)
+            if best_score > checkpoint['best_score']:
+                checkpoint['best_score'] = best_score
+                checkpoint['best_weights'] = population[
+                    scores.index(best_score)
+                ]
+            print(
+                f'Generation {generation + 1}/{generations}: '
+                f'best {best_score:.2f}, '
+                f'all-time {checkpoint["best_score"]:.2f}'
+            )
+            population = next_generation(rng, population, scores, elite)
+            checkpoint.update(
+                generation=generation + 1,
+                population=population,
+                rng_state=rng.getstate()
+            )
+            save_checkpoint(checkpoint_path, checkpoint)
+
+        # next_generation() ставит элиту в начало популяции.
+        finalists = [checkpoint['best_weights']]
+        for weights in population[:min(elite, population_size - 1)]:
+            if weights not in finalists:
+                finalists.append(weights)
+        return select_final_weights(
+            pool, scoreboard, finalists, holdout_seeds
+        )
+    finally:
+        pool.close()
+        pool.join()
+        scoreboard.close()
+        scoreboard.unlink()
+
+
+def main() -> None:
+    """Консольный интерфейс поиска весов бота."""
+    parser = argparse.ArgumentParser(
+        description='Эволюционный поиск весов эвристического бота.'
+    )
+    parser.add_argument('--generations', type=int, default=20)
+    parser.add_argument('--population', type=int, default=16)
+    parser.add_argument('--games', type=int, default=8)
+    parser.add_argument('--elite', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--checkpoint', default='bot_search.json')
+    parser.add_argument('--export', default='bot_profile.json')
+    parser.add_argument(
+        '--reset', action='store_true',
+        help='начать поиск заново, удалив контрольную точку'
+    )
+    args = parser.parse_args()
+    for name in ('population', 'games', 'elite'):
+        if getattr(args, name) < 1:
+            parser.error(f'--{name} должен быть не меньше 1')
+    if args.processes is not None and args.processes < 1:
+        parser.error('--processes должен быть не меньше 1')
+
+    if args.reset:
+        checkpoint_path = os.path.join(CURRENT_DIR, '..', args.checkpoint)
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    try:
+        weights, score = search_bot_weights(
+            generations=args.generations,
+            population_size=args.population,
+            games=args.games,
+            elite=args.elite,
+            seed=args.seed,
+            checkpoint_name=args.checkpoint,
+            processes=args.processes
+        )
+    except CheckpointMismatchError as error:
+        parser.error(str(error))
+
+    export_path = os.path.join(CURRENT_DIR, '..', args.export)
+    export_bot_profile(export_path, weights, score)
+    print(
+        f'Best weights {asdict(weights)} '
+        f'(held-out {score:.2f}) -> {args.export}'
+    )
+
+
+if __name__ == '__main__':
+    main()
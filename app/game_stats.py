@@ -0,0 +1,331 @@
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Optional
+
+
+CURRENT_DIR: str = os.path.dirname(__file__)
+
+# Формат даты, в котором write_game_result записывает результаты:
+DATETIME_FORMAT: str = '%d.%m.%Y (%H:%M:%S)'
+DAY_FORMAT: str = '%d.%m.%Y'
+
+# Размер блока чтения файла с результатами (байты):
+CHUNK_SIZE: int = 64 * 1024
+
+# Максимальная пауза между играми одной сессии (секунды):
+SESSION_GAP: int = 30 * 60
+
+# Сколько байт от начала файла сверяется, чтобы заметить его замену:
+PREFIX_SIZE: int = 1024
+
+# Версия формата файла с агрегатами; файлы другой версии пересчитываются:
+AGGREGATES_VERSION: int = 2
+
+# Время игр отсчитывается от этой даты без учёта часового пояса, чтобы
+# переход на летнее время не разрывал и не склеивал сессии:
+EPOCH: datetime = datetime(1970, 1, 1)
+
+
+class GameStats:
+    """
+    Накопительная статистика по группе игр: количество, среднее, медиана,
+    90-й процентиль, лучший результат и игровые сессии (серии игр, между
+    которыми прошло не больше SESSION_GAP секунд). Для квантилей хранится
+    гистограмма длин змейки: длина ограничена размером поля, поэтому
+    гистограмма остаётся небольшой, а квантили — точными.
+    """
+
+    def __init__(self, state: Optional[dict] = None):
+        """
+        Parameters
+        ----------
+        state : dict
+            Сохранённое состояние, полученное из to_dict().
+        """
+        state = state or {}
+        self.count = int(state.get('count', 0))
+        self.total = int(state.get('total', 0))
+        self.best = int(state.get('best', 0))
+        self.sessions = int(state.get('sessions', 0))
+        self.session_length = int(state.get('session_length', 0))
+        self.longest_session = int(state.get('longest_session', 0))
+        last_timestamp = state.get('last_timestamp')
+        self.last_timestamp: Optional[float] = (
+            None if last_timestamp is None else float(last_timestamp)
+        )
+        self.lengths: dict[int, int] = {
+            int(length): int(count)
+            for length, count in state.get('lengths', {}).items()
+        }
+
+    def add(self, played_at: datetime, snake_length: int) -> None:
+        """Учитывает результат одной игры."""
+        self.count += 1
+        self.total += snake_length
+        self.best = max(self.best, snake_length)
+        self.lengths[snake_length] = self.lengths.get(snake_length, 0) + 1
+
+        timestamp = (played_at - EPOCH).total_seconds()
+        if (
+            self.last_timestamp is None
+            or timestamp - self.last_timestamp > SESSION_GAP
+        ):
+            self.sessions += 1
+            self.session_length = 0
+        self.session_length += 1
+        self.longest_session = max(self.longest_session, self.session_length)
+        self.last_timestamp = timestamp
+
+    @property
+    def mean(self) -> float:
+        """Средняя длина змейки."""
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Точный квантиль длины змейки с линейной интерполяцией между
+        соседними значениями упорядоченной выборки.
+        """
+        if not self.count:
+            return 0.0
+        position = q * (self.count - 1)
+        rank = int(position)
+        lower = self._length_at(rank)
+        upper = self._length_at(min(rank + 1, self.count - 1))
+        return lower + (upper - lower) * (position - rank)
+
+    def _length_at(self, rank: int) -> int:
+        """Длина змейки на позиции rank упорядоченной выборки."""
+        seen = 0
+        for length in sorted(self.lengths):
+            seen += self.lengths[length]
+            if seen > rank:
+                return length
+        return self.best
+
+    def to_dict(self) -> dict:
+        """Возвращает состояние статистики для сохранения в JSON."""
+        return {
+            'count': self.count,
+            'total': self.total,
+            'best': self.best,
+            'sessions': self.sessions,
+            'session_length': self.session_length,
+            'longest_session': self.longest_session,
+            'last_timestamp': self.last_timestamp,
+            'lengths': self.lengths,
+        }
+
+
+def parse_game_result(line: str) -> Optional[tuple[datetime, str, int]]:
+    """
+    Разбирает строку, записанную write_game_result. Возвращает None для
+    повреждённых строк.
+    """
+    try:
+        raw_datetime, nickname, raw_length = line.rstrip('\r\n').split('\t')
+        return (
+            datetime.strptime(raw_datetime, DATETIME_FORMAT),
+            nickname,
+            int(raw_length),
+        )
+    except ValueError:
+        return None
+
+
+def empty_aggregates() -> dict:
+    """Пустое состояние статистики."""
+    return {
+        'version': AGGREGATES_VERSION,
+        'offset': 0,
+        'prefix_hash': None,
+        'nicknames': {},
+        'days': {},
+    }
+
+
+def is_valid_aggregates(aggregates) -> bool:
+    """Проверяет структуру и типы значений загруженных агрегатов."""
+    return (
+        isinstance(aggregates, dict)
+        and set(aggregates) == set(empty_aggregates())
+        and aggregates['version'] == AGGREGATES_VERSION
+        and type(aggregates['offset']) is int
+        and aggregates['offset'] >= 0
+        and isinstance(aggregates['prefix_hash'], (str, type(None)))
+        and all(
+            isinstance(groups, dict)
+            and all(isinstance(state, dict) for state in groups.values())
+            for groups in (aggregates['nicknames'], aggregates['days'])
+        )
+    )
+
+
+def load_aggregates(sidecar_path: str) -> dict:
+    """
+    Загружает сохранённые агрегаты. Если файла нет, он повреждён или имеет
+    другую структуру, возвращает пустое состояние.
+    """
+    if os.path.exists(sidecar_path):
+        try:
+            with open(sidecar_path, mode='r', encoding='utf-8') as file:
+                aggregates = json.load(file)
+            if is_valid_aggregates(aggregates):
+                return aggregates
+        except (OSError, ValueError):
+            pass
+    return empty_aggregates()
+
+
+def save_aggregates(sidecar_path: str, aggregates: dict) -> None:
+    """Атомарно сохраняет агрегаты в файл рядом с результатами."""
+    tmp_path = sidecar_path + '.tmp'
+    with open(tmp_path, mode='w', encoding='utf-8') as file:
+        json.dump(aggregates, file, ensure_ascii=False)
+    os.replace(tmp_path, sidecar_path)
+
+
+def prefix_hash(file_path: str, size: int) -> Optional[str]:
+    """Хеш первых size байт файла (но не больше PREFIX_SIZE)."""
+    if not size:
+        return None
+    with open(file_path, mode='rb') as file:
+        return hashlib.sha256(file.read(min(size, PREFIX_SIZE))).hexdigest()
+
+
+def restore_game_stats(groups: dict[str, dict]) -> dict[str, GameStats]:
+    """Восстанавливает статистику групп из сохранённого состояния."""
+    return {key: GameStats(state) for key, state in groups.items()}
+
+
+def update_game_stats(
+        file_name: str = 'game_results.csv',
+        sidecar_name: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE
+) -> tuple[dict[str, GameStats], dict[str, GameStats]]:
+    """
+    Дочитывает новые строки файла с результатами блоками по chunk_size байт
+    и обновляет статистику по никнеймам и по дням. Смещение и агрегаты
+    хранятся в файле sidecar_name, поэтому уже обработанные строки повторно
+    не читаются. Если файл результатов стал короче или его начало
+    изменилось (файл заменили), статистика пересчитывается заново.
+    """
+    file_dir = os.path.join(CURRENT_DIR, '..')
+    file_path = os.path.join(file_dir, file_name)
+    sidecar_path = os.path.join(
+        file_dir, sidecar_name or f'{file_name}.stats.json'
+    )
+
+    aggregates = load_aggregates(sidecar_path)
+    size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+    offset = aggregates['offset']
+    if size < offset or (
+        prefix_hash(file_path, offset) != aggregates['prefix_hash']
+    ):
+        aggregates = empty_aggregates()
+        offset = 0
+
+    try:
+        by_nickname = restore_game_stats(aggregates['nicknames'])
+        by_day = restore_game_stats(aggregates['days'])
+    except (AttributeError, TypeError, ValueError):
+        offset = 0
+        by_nickname, by_day = {}, {}
+
+    if size > offset:
+        offset = _consume(file_path, offset, chunk_size, by_nickname, by_day)
+
+    save_aggregates(sidecar_path, {
+        'version': AGGREGATES_VERSION,
+        'offset': offset,
+        'prefix_hash': prefix_hash(file_path, offset),
+        'nicknames': {k: v.to_dict() for k, v in by_nickname.items()},
+        'days': {k: v.to_dict() for k, v in by_day.items()},
+    })
+    return by_nickname, by_day
+
+
+def _consume(
+        file_path: str,
+        offset: int,
+        chunk_size: int,
+        by_nickname: dict[str, GameStats],
+        by_day: dict[str, GameStats]
+) -> int:
+    """
+    Читает файл с позиции offset и возвращает смещение после последней
+    полной строки. Недописанная строка в конце файла будет прочитана при
+    следующем запуске.
+    """
+    tail = b''
+    with open(file_path, mode='rb') as file:
+        file.seek(offset)
+        while chunk := file.read(chunk_size):
+            lines = (tail + chunk).split(b'\n')
+            tail = lines.pop()
+            for line in lines:
+                offset += len(line) + 1
+                result = parse_game_result(line.decode('utf-8', 'replace'))
+                if result is None:
+                    continue
+                played_at, nickname, snake_length = result
+                day = played_at.strftime(DAY_FORMAT)
+                by_nickname.setdefault(nickname, GameStats()).add(
+                    played_at, snake_length
+                )
+                by_day.setdefault(day, GameStats()).add(
+                    played_at, snake_length
+                )
+    return offset
+
+
+def format_game_stats(title: str, stats: dict[str, GameStats]) -> str:
+    """Форматирует статистику в виде текстовой таблицы."""
+    header = (
+        f'{title:<12}{"games":>7}{"mean":>8}{"median":>8}{"p90":>8}'
+        f'{"best":>6}{"sessions":>10}{"streak":>8}'
+    )
+    rows = [header, '-' * len(header)]
+    for key, item in stats.items():
+        rows.append(
+            f'{key:<12}{item.count:>7}{item.mean:>8.2f}'
+            f'{item.quantile(0.5):>8.1f}'
+            f'{item.quantile(0.9):>8.1f}'
+            f'{item.best:>6}{item.sessions:>10}{item.longest_session:>8}'
+        )
+    return '\n'.join(rows)
+
+
+def main() -> None:
+    """Консольный интерфейс статистики по результатам игр."""
+    parser = argparse.ArgumentParser(
+        description='Статистика по результатам игр из game_results.csv.'
+    )
+    parser.add_argument('--file', default='game_results.csv')
+    parser.add_argument(
+        '--by', choices=('nickname', 'day', 'all'), default='all'
+    )
+    parser.add_argument(
+        '--reset', action='store_true',
+        help='пересчитать статистику с начала файла'
+    )
+    args = parser.parse_args()
+
+    sidecar_name = f'{args.file}.stats.json'
+    if args.reset:
+        sidecar_path = os.path.join(CURRENT_DIR, '..', sidecar_name)
+        if os.path.exists(sidecar_path):
+            os.remove(sidecar_path)
+
+    by_nickname, by_day = update_game_stats(args.file, sidecar_name)
+    if args.by in ('nickname', 'all'):
+        print(format_game_stats('nickname', by_nickname))
+    if args.by in ('day', 'all'):
+        print(format_game_stats('day', by_day))
+
+
+if __name__ == '__main__':
+    main()
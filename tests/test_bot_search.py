@@ -0,0 +1,217 @@
+import random
+import sys
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from app import bot_search
+from app.bot_search import (
+    BotWeights, CheckpointMismatchError, SnakeBot, create_search_pool,
+    export_bot_profile, grid_distance, load_bot_profile, load_checkpoint,
+    next_generation, play_headless_game, save_checkpoint, score_population,
+    search_bot_weights, select_final_weights
+)
+from the_snake import DOWN, GRID_SIZE, LEFT, SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+@pytest.fixture
+def short_games(monkeypatch):
+    # Змейка быстро умирает от голода, поэтому игры короткие.
+    monkeypatch.setattr(bot_search, 'MAX_STEPS_WITHOUT_APPLE', 10)
+
+
+def test_headless_game_is_deterministic(short_games):
+    bot = SnakeBot()
+    assert play_headless_game(bot, 7) == play_headless_game(bot, 7), (
+        'Игра с одним и тем же сидом должна давать одинаковый результат.'
+    )
+
+
+def test_move_into_body_is_fatal(snake, apple):
+    snake.positions = [(100, 100), (120, 100), (120, 120), (100, 120),
+                       (80, 120)]
+    snake.length = len(snake.positions)
+    snake.direction = LEFT
+    bot = SnakeBot()
+    assert bot.evaluate(snake, apple, DOWN) == float('-inf')
+    assert bot.evaluate(snake, apple, LEFT) > float('-inf')
+
+
+@pytest.mark.parametrize('first, second, expected', [
+    ((0, 0), (0, 0), 0),
+    ((0, 0), (3 * GRID_SIZE, 2 * GRID_SIZE), 5),
+    ((0, 0), (SCREEN_WIDTH - GRID_SIZE, 0), 1),
+    ((0, 0), (0, SCREEN_HEIGHT - GRID_SIZE), 1),
+    ((0, 0), (SCREEN_WIDTH - GRID_SIZE, SCREEN_HEIGHT - GRID_SIZE), 2),
+])
+def test_grid_distance_wraps(first, second, expected):
+    assert grid_distance(first, second) == expected
+    assert grid_distance(second, first) == expected
+
+
+def test_next_generation_keeps_size_and_elite():
+    rng = random.Random(0)
+    population = [BotWeights.sample(rng) for _ in range(6)]
+    scores = [3.0, 9.0, 1.0, 7.0, 2.0, 5.0]
+    children = next_generation(rng, population, scores, elite=2)
+    assert len(children) == len(population)
+    assert children[:2] == [population[1], population[3]]
+
+    children = next_generation(rng, population, scores, elite=10)
+    assert len(children) == len(population)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    rng = random.Random(42)
+    rng.random()
+    checkpoint = {
+        'params': {'population_size': 2, 'games': 1, 'elite': 1, 'seed': 42},
+        'generation': 3,
+        'population': [BotWeights(), BotWeights(0.5, 2.0, 3.0)],
+        'best_weights': BotWeights(0.5, 2.0, 3.0),
+        'best_score': 12.5,
+        'rng_state': rng.getstate(),
+    }
+    file_path = str(tmp_path / 'bot_search.json')
+    save_checkpoint(file_path, checkpoint)
+    loaded = load_checkpoint(file_path)
+    assert loaded == checkpoint
+
+    restored = random.Random()
+    restored.setstate(loaded['rng_state'])
+    assert restored.random() == rng.random()
+
+
+def test_bot_profile_round_trip(tmp_path):
+    weights = BotWeights(1.5, 0.25, 4.0)
+    file_path = str(tmp_path / 'bot_profile.json')
+    export_bot_profile(file_path, weights, 10.0)
+    assert load_bot_profile(file_path).weights == weights
+
+
+def mean_score(weights, seeds):
+    return sum(
+        play_headless_game(SnakeBot(weights), seed) for seed in seeds
+    ) / len(seeds)
+
+
+@pytest.fixture
+def search_pool():
+    pool, scoreboard = create_search_pool(2, 2, 1)
+    yield pool, scoreboard
+    pool.close()
+    pool.join()
+    scoreboard.close()
+    scoreboard.unlink()
+
+
+def test_score_population_uses_shared_scoreboard(short_games, search_pool):
+    population = [BotWeights(), BotWeights(0.0, 0.0, 0.0)]
+    seeds = [1, 2]
+    scores = score_population(*search_pool, population, seeds)
+    assert scores == [mean_score(weights, seeds) for weights in population]
+
+
+def test_select_final_weights_picks_held_out_winner(
+    short_games, search_pool
+):
+    finalists = [BotWeights(0.0, 0.0, 0.0), BotWeights()]
+    seeds = [3, 4]
+    expected = [mean_score(weights, seeds) for weights in finalists]
+    assert expected[0] != expected[1]
+
+    weights, score = select_final_weights(*search_pool, finalists, seeds)
+    assert score == max(expected)
+    assert weights == finalists[expected.index(max(expected))]
+
+
+SEARCH_PARAMS = {'population_size': 3, 'games': 1, 'elite': 1, 'seed': 5}
+
+
+def test_search_resumes_from_checkpoint(short_games, tmp_path, capsys):
+    checkpoint = str(tmp_path / 'bot_search.json')
+    search_bot_weights(
+        generations=1, checkpoint_name=checkpoint, processes=1,
+        **SEARCH_PARAMS
+    )
+    assert load_checkpoint(checkpoint)['generation'] == 1
+    capsys.readouterr()
+
+    weights, score = search_bot_weights(
+        generations=2, checkpoint_name=checkpoint, processes=1,
+        **SEARCH_PARAMS
+    )
+    output = capsys.readouterr().out
+    assert 'Generation 1/2' not in output, (
+        'Повторный запуск должен продолжать поиск с контрольной точки.'
+    )
+    assert 'Generation 2/2' in output
+    assert load_checkpoint(checkpoint)['generation'] == 2
+    assert isinstance(weights, BotWeights) and score >= 1
+
+
+@pytest.mark.parametrize('changed', [
+    {'population_size': 4}, {'games': 2}, {'elite': 2}, {'seed': 6},
+])
+def test_search_rejects_checkpoint_with_other_params(
+    short_games, tmp_path, changed
+):
+    checkpoint = str(tmp_path / 'bot_search.json')
+    search_bot_weights(
+        generations=1, checkpoint_name=checkpoint, processes=1,
+        **SEARCH_PARAMS
+    )
+    with pytest.raises(CheckpointMismatchError):
+        search_bot_weights(
+            generations=1, checkpoint_name=checkpoint, processes=1,
+            **{**SEARCH_PARAMS, **changed}
+        )
+
+
+def run_cli(monkeypatch, tmp_path, *args):
+    monkeypatch.setattr(sys, 'argv', [
+        'bot_search.py', '--generations', '1', '--games', '1',
+        '--processes', '1',
+        '--checkpoint', str(tmp_path / 'bot_search.json'),
+        '--export', str(tmp_path / 'bot_profile.json'), *args
+    ])
+    bot_search.main()
+
+
+def test_cli_reset_starts_new_search(short_games, tmp_path, monkeypatch):
+    run_cli(monkeypatch, tmp_path, '--population', '2')
+    with pytest.raises(SystemExit):
+        run_cli(monkeypatch, tmp_path, '--population', '3')
+
+    run_cli(monkeypatch, tmp_path, '--population', '3', '--reset')
+    checkpoint = load_checkpoint(str(tmp_path / 'bot_search.json'))
+    assert checkpoint['params']['population_size'] == 3
+    assert load_bot_profile(str(tmp_path / 'bot_profile.json'))
+
+
+@pytest.mark.parametrize('args', [
+    ('--elite', '0'), ('--games', '0'), ('--population', '0'),
+    ('--processes', '0'),
+])
+def test_cli_rejects_invalid_arguments(tmp_path, monkeypatch, args):
+    monkeypatch.setattr(bot_search, 'search_bot_weights', None)
+    with pytest.raises(SystemExit):
+        run_cli(monkeypatch, tmp_path, *args)
+
+
+def test_pool_failure_releases_scoreboard(monkeypatch):
+    created = []
+
+    def tracking_shared_memory(*args, **kwargs):
+        created.append(SharedMemory(*args, **kwargs))
+        return created[-1]
+
+    def failing_pool(*args, **kwargs):
+        raise OSError('no processes')
+
+    monkeypatch.setattr(bot_search, 'SharedMemory', tracking_shared_memory)
+    monkeypatch.setattr(bot_search, 'Pool', failing_pool)
+    with pytest.raises(OSError):
+        create_search_pool(2, 2, 1)
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=created[0].name)
@@ -0,0 +1,187 @@
+import time
+
+import pytest
+
+from app import game_stats
+from app.game_stats import parse_game_result, update_game_stats
+
+
+SAMPLE_LOG = (
+    '09.11.2024 (15:44:35)\tUSER\t10\n'
+    '09.11.2024 (15:44:44)\tUSER\t1\n'
+    '10.11.2024 (14:55:32)\tUSER\t26\n'
+    '10.11.2024 (14:55:37)\tUSER\t1\n'
+    '10.11.2024 (15:12:11)\tUSER\t5\n'
+    '10.11.2024 (15:45:16)\tUSER\t9\n'
+    '10.11.2024 (15:58:02)\tUSER\t22\n'
+    '10.11.2024 (15:59:42)\tUSER\t1\n'
+    '10.11.2024 (16:00:32)\tUSER\t2\n'
+    '10.11.2024 (16:02:51)\tUSER\t2\n'
+)
+
+
+@pytest.fixture
+def results_file(tmp_path):
+    return tmp_path / 'game_results.csv'
+
+
+def test_parse_game_result():
+    played_at, nickname, snake_length = parse_game_result(
+        '10.11.2024 (16:02:51)\tUSER\t2\n'
+    )
+    assert (played_at.day, played_at.hour, nickname, snake_length) == (
+        10, 16, 'USER', 2
+    )
+
+
+@pytest.mark.parametrize('line', [
+    '',
+    '10.11.2024 (16:02:51)\tUSER\n',
+    '10.11.2024 (16:02:51)\tUSER\ttwo\n',
+    '2024-11-10 16:02:51\tUSER\t2\n',
+    '10.11.2024 (16:02:51)\tUSER\t2\textra\n',
+])
+def test_parse_game_result_rejects_bad_lines(line):
+    assert parse_game_result(line) is None, (
+        f'Повреждённая строка `{line!r}` должна пропускаться.'
+    )
+
+
+def test_sample_log_stats(results_file):
+    results_file.write_text(SAMPLE_LOG, encoding='utf-8')
+    by_nickname, by_day = update_game_stats(str(results_file))
+
+    user = by_nickname['USER']
+    assert (user.count, user.best) == (10, 26)
+    assert (user.sessions, user.longest_session) == (3, 5)
+    assert user.quantile(0.5) == pytest.approx(3.5)
+    assert user.quantile(0.9) == pytest.approx(22.4)
+
+    day = by_day['10.11.2024']
+    assert (day.count, day.sessions, day.longest_session) == (8, 2, 5)
+    assert day.quantile(0.9) == pytest.approx(23.2)
+
+
+def test_quantiles_of_small_groups(results_file):
+    results_file.write_text(SAMPLE_LOG[:31], encoding='utf-8')
+    by_nickname, _ = update_game_stats(str(results_file))
+    single = by_nickname['USER']
+    assert single.quantile(0.5) == single.quantile(0.9) == 10
+
+    results_file.write_text(SAMPLE_LOG[:62], encoding='utf-8')
+    by_nickname, _ = update_game_stats(str(results_file))
+    pair = by_nickname['USER']
+    assert pair.quantile(0.5) == pytest.approx(5.5)
+    assert pair.quantile(0.9) == pytest.approx(9.1)
+
+
+def test_incremental_run_reads_only_appended_lines(
+    results_file, monkeypatch
+):
+    lines = SAMPLE_LOG.splitlines(keepends=True)
+    results_file.write_text(''.join(lines[:4]), encoding='utf-8')
+    update_game_stats(str(results_file), chunk_size=16)
+
+    parsed_lines = []
+
+    def counting_parse(line):
+        parsed_lines.append(line)
+        return parse_game_result(line)
+
+    monkeypatch.setattr(game_stats, 'parse_game_result', counting_parse)
+    with open(results_file, mode='a', encoding='utf-8') as file:
+        file.write(''.join(lines[4:]))
+    by_nickname, by_day = update_game_stats(str(results_file), chunk_size=16)
+
+    assert parsed_lines == [line.rstrip() for line in lines[4:]], (
+        'При повторном запуске должны читаться только дописанные строки.'
+    )
+    assert by_nickname['USER'].count == 10
+    assert (by_nickname['USER'].sessions, by_day['10.11.2024'].count) == (
+        3, 8
+    )
+
+    parsed_lines.clear()
+    update_game_stats(str(results_file))
+    assert parsed_lines == []
+
+
+def test_unfinished_line_is_read_next_run(results_file):
+    results_file.write_text(SAMPLE_LOG[:-5], encoding='utf-8')
+    by_nickname, _ = update_game_stats(str(results_file))
+    assert by_nickname['USER'].count == 9, (
+        'Недописанная последняя строка не должна учитываться.'
+    )
+
+    results_file.write_text(SAMPLE_LOG, encoding='utf-8')
+    by_nickname, _ = update_game_stats(str(results_file))
+    assert by_nickname['USER'].count == 10
+    assert by_nickname['USER'].longest_session == 5
+
+
+def test_truncated_file_is_recomputed(results_file):
+    results_file.write_text(SAMPLE_LOG, encoding='utf-8')
+    update_game_stats(str(results_file))
+
+    results_file.write_text(SAMPLE_LOG[:62], encoding='utf-8')
+    by_nickname, by_day = update_game_stats(str(results_file))
+    assert by_nickname['USER'].count == 2
+    assert list(by_day) == ['09.11.2024']
+
+
+def test_replaced_file_is_recomputed(results_file):
+    results_file.write_text(SAMPLE_LOG, encoding='utf-8')
+    update_game_stats(str(results_file))
+
+    results_file.write_text(
+        SAMPLE_LOG.replace('USER', 'GOST') + SAMPLE_LOG, encoding='utf-8'
+    )
+    by_nickname, _ = update_game_stats(str(results_file))
+    assert by_nickname['GOST'].count == 10
+    assert by_nickname['USER'].count == 10
+
+
+def test_sidecar_with_other_structure_is_ignored(results_file):
+    results_file.write_text(SAMPLE_LOG, encoding='utf-8')
+    stats_file = results_file.with_name('game_results.csv.stats.json')
+    stats_file.write_text('{"offset": 5}', encoding='utf-8')
+    by_nickname, _ = update_game_stats(str(results_file))
+    assert by_nickname['USER'].count == 10
+
+
+@pytest.mark.parametrize('sidecar', [
+    '[]',
+    '{"offset": 0, "prefix_hash": null, "nicknames": {}, "days": {}}',
+    '{"version": 2, "offset": "5", "prefix_hash": null, '
+    '"nicknames": {}, "days": {}}',
+    '{"version": 2, "offset": 0, "prefix_hash": null, '
+    '"nicknames": [], "days": {}}',
+    '{"version": 2, "offset": 0, "prefix_hash": null, '
+    '"nicknames": {"USER": []}, "days": {}}',
+    '{"version": 2, "offset": 0, "prefix_hash": null, '
+    '"nicknames": {"USER": {"count": "many"}}, "days": {}}',
+])
+def test_sidecar_with_wrong_types_is_ignored(results_file, sidecar):
+    results_file.write_text(SAMPLE_LOG, encoding='utf-8')
+    stats_file = results_file.with_name('game_results.csv.stats.json')
+    stats_file.write_text(sidecar, encoding='utf-8')
+    by_nickname, _ = update_game_stats(str(results_file))
+    assert by_nickname['USER'].count == 10
+
+
+def test_sessions_do_not_depend_on_dst(results_file, monkeypatch):
+    # В ночь на 31.03.2024 в Берлине час с 02:00 до 03:00 пропущен: между
+    # играми прошло 80 минут по часам, сессии должны быть разными.
+    monkeypatch.setenv('TZ', 'Europe/Berlin')
+    time.tzset()
+    try:
+        results_file.write_text(
+            '31.03.2024 (01:50:00)\tUSER\t3\n'
+            '31.03.2024 (03:10:00)\tUSER\t4\n',
+            encoding='utf-8'
+        )
+        by_nickname, _ = update_game_stats(str(results_file))
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    assert by_nickname['USER'].sessions == 2